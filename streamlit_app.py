@@ -2,33 +2,39 @@
 app.py — Centered HTML Refresh button + responsive grid (single-file)
 
 Summary:
-- Refresh button rendered in HTML for pixel control; clicking it navigates to ?refresh=<ts>.
-- App detects ?refresh, clears cache, removes the param and reruns.
-- Cards rendered as one responsive HTML grid via components.html; computed height prevents clipping.
+- Refresh button rendered in HTML for pixel control; clicking it navigates to ?refresh=1.
+- App detects ?refresh, clears the data caches (debounced) and removes the param.
+- Cards rendered inline as one responsive HTML grid via st.html (no iframe).
 - Left sidebar, CSV button, cache banners and footer removed.
 
 Run:
-    pip install streamlit yfinance pandas numpy
+    pip install streamlit yfinance pandas numpy numba
     streamlit run app.py
 """
 
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import numpy as np
-import math
+import base64
+import logging
 import time
-import streamlit.components.v1 as components
+import threading
+import warnings
+from functools import lru_cache
+from numba import njit
+
+logger = logging.getLogger(__name__)
 
 # -------------------------
 # Config
 # -------------------------
 RSI_PERIOD = 14
+RSI_WARMUP_BARS = 250  # seed weight left after n bars is (13/14)^n (~1e-8 at 250); RSI drift stays well below 0.01
 VOL_DAYS = 252
 CACHE_TTL_SECONDS = 600
+REFRESH_DEBOUNCE_SECONDS = 5  # ignore repeat refresh clicks within this window
 LOOKBACK = "2y"
 N_CARDS = 10
-CARD_HEIGHT = 170  # px (used to compute iframe height)
 
 # NIFTY50 tickers (common set)
 NIFTY50 = [
@@ -42,6 +48,28 @@ NIFTY50 = [
     "SHREECEM.NS","HINDALCO.NS"
 ]
 
+# Static company names (avoids one yf.Ticker(tk).info HTTP round-trip per card)
+NIFTY50_NAMES = {
+    "RELIANCE.NS": "Reliance Industries", "TCS.NS": "Tata Consultancy Services",
+    "HDFCBANK.NS": "HDFC Bank", "INFY.NS": "Infosys", "ICICIBANK.NS": "ICICI Bank",
+    "KOTAKBANK.NS": "Kotak Mahindra Bank", "LT.NS": "Larsen & Toubro", "ITC.NS": "ITC",
+    "SBIN.NS": "State Bank of India", "HCLTECH.NS": "HCL Technologies",
+    "AXISBANK.NS": "Axis Bank", "BHARTIARTL.NS": "Bharti Airtel", "BAJAJ-AUTO.NS": "Bajaj Auto",
+    "ASIANPAINT.NS": "Asian Paints", "HINDUNILVR.NS": "Hindustan Unilever",
+    "MARUTI.NS": "Maruti Suzuki India", "SUNPHARMA.NS": "Sun Pharmaceutical Industries",
+    "NTPC.NS": "NTPC", "M&M.NS": "Mahindra & Mahindra", "BAJFINANCE.NS": "Bajaj Finance",
+    "ULTRACEMCO.NS": "UltraTech Cement", "TITAN.NS": "Titan Company",
+    "POWERGRID.NS": "Power Grid Corporation of India", "ONGC.NS": "Oil & Natural Gas Corporation",
+    "HDFCLIFE.NS": "HDFC Life Insurance", "NESTLEIND.NS": "Nestle India",
+    "DIVISLAB.NS": "Divi's Laboratories", "WIPRO.NS": "Wipro", "BRITANNIA.NS": "Britannia Industries",
+    "TECHM.NS": "Tech Mahindra", "COALINDIA.NS": "Coal India", "SBILIFE.NS": "SBI Life Insurance",
+    "ADANIENT.NS": "Adani Enterprises", "ADANIPORTS.NS": "Adani Ports and SEZ",
+    "TATASTEEL.NS": "Tata Steel", "BPCL.NS": "Bharat Petroleum", "INDUSINDBK.NS": "IndusInd Bank",
+    "GRASIM.NS": "Grasim Industries", "EICHERMOT.NS": "Eicher Motors", "JSWSTEEL.NS": "JSW Steel",
+    "DRREDDY.NS": "Dr. Reddy's Laboratories", "TATAMOTORS.NS": "Tata Motors", "CIPLA.NS": "Cipla",
+    "SHREECEM.NS": "Shree Cement", "HINDALCO.NS": "Hindalco Industries",
+}
+
 PALETTE = {
     "accent": "#2B8AEB",
     "green": "#2ecc71",
@@ -56,140 +84,176 @@ PALETTE = {
 # -------------------------
 # Financial helpers
 # -------------------------
-def rsi(series: pd.Series, period=RSI_PERIOD) -> pd.Series:
-    s = series.dropna().astype(float)
-    if s.empty:
-        return s
-    delta = s.diff()
-    up = delta.clip(lower=0)
-    down = -delta.clip(upper=0)
-    avg_up = up.ewm(alpha=1/period, adjust=False).mean()
-    avg_down = down.ewm(alpha=1/period, adjust=False).mean()
-    rs = avg_up / avg_down
-    r = 100 - (100 / (1 + rs))
-    return r
-
-def annual_vol(close_series: pd.Series) -> float:
-    s = close_series.dropna().astype(float)
-    if len(s) < 10:
-        return float("nan")
-    s = s.iloc[-VOL_DAYS:] if len(s) >= VOL_DAYS else s
-    log_ret = np.log(s / s.shift(1)).dropna()
-    if len(log_ret) < 2:
+@njit(cache=True)
+def wilder_rsi_last(a, period):
+    # fused diff -> up/down -> Wilder RMA (ewm(alpha=1/period, adjust=False)) in one pass,
+    # keeping only the two running averages: no temporary arrays are allocated
+    alpha = 1.0 / period
+    d = a[1] - a[0]
+    avg_up = d if d > 0.0 else 0.0
+    avg_down = -d if d < 0.0 else 0.0
+    for i in range(2, a.shape[0]):
+        d = a[i] - a[i - 1]
+        avg_up += alpha * ((d if d > 0.0 else 0.0) - avg_up)
+        avg_down += alpha * ((-d if d < 0.0 else 0.0) - avg_down)
+    if avg_down == 0.0:
+        return 100.0 if avg_up > 0.0 else np.nan
+    return 100.0 - 100.0 / (1.0 + avg_up / avg_down)
+
+def rsi_last(close_values: np.ndarray, period=RSI_PERIOD) -> float:
+    a = np.asarray(close_values, dtype=np.float64)
+    a = a[~np.isnan(a)]
+    if len(a) < 2:
         return float("nan")
-    return float(log_ret.std(ddof=0) * np.sqrt(252))
+    return float(wilder_rsi_last(a, period))
+
+def weekly_closes(daily: pd.Series) -> pd.Series:
+    # last close of each Mon-Sun week, same as resample('W').last() without the Grouper
+    idx = daily.index
+    if getattr(idx, "tz", None) is not None:
+        idx = idx.tz_localize(None)
+    days = idx.values.astype("datetime64[D]").astype(np.int64)
+    week_id = (days + 3) // 7  # 1970-01-01 was a Thursday; shift so weeks start Monday
+    last_of_week = np.empty(len(week_id), dtype=bool)
+    last_of_week[:-1] = week_id[1:] != week_id[:-1]
+    last_of_week[-1:] = True
+    return daily[last_of_week]
+
+OHLC = ["Open", "High", "Low", "Close"]
+
+def gk_vols(panel: pd.DataFrame) -> pd.Series:
+    # Garman-Klass range-based vol over a (ticker, OHLC field) column panel, one matrix op per field
+    p = panel.tail(VOL_DAYS)
+    opn, high, low, close = (p.xs(f, axis=1, level=1).to_numpy(dtype=np.float64) for f in OHLC)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        hl = np.log(high / low) ** 2
+        term = 0.5 * hl - (2 * np.log(2) - 1) * np.log(close / opn) ** 2
+    term[~np.isfinite(term)] = np.nan
+    hl[~np.isfinite(hl)] = np.nan
+    n = np.count_nonzero(~np.isnan(term), axis=0)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns; masked by n below
+        var = np.nanmean(term, axis=0)
+        # GK can go negative when open-close moves dominate the ranges; use Parkinson
+        # (high-low only, never negative) for those tickers rather than dropping them
+        var = np.where(var > 0, var, np.nanmean(hl, axis=0) / (4 * np.log(2)))
+    vols = np.sqrt(var * 252)
+    vols[n < 10] = np.nan
+    return pd.Series(vols, index=p.xs("Close", axis=1, level=1).columns)
 
 # -------------------------
 # Data fetch (cached)
 # -------------------------
 @st.cache_data(ttl=CACHE_TTL_SECONDS)
 def fetch_all(tickers):
+    import yfinance as yf  # imported lazily here, not at module top (slow cold start)
     try:
-        raw = yf.download(tickers, period=LOOKBACK, interval="1d", group_by="ticker", threads=True, progress=False)
+        raw = yf.download(tickers, period=LOOKBACK, interval="1d", group_by="ticker",
+                          threads=True, progress=False, auto_adjust=False)
     except Exception as e:
+        logger.warning("batch download failed: %s", e)
         st.session_state["_last_fetch_error"] = str(e)
         return {}
     out = {}
     if len(tickers) == 1:
         out[tickers[0]] = raw
         return out
+    # one batch download only: failed tickers (absent, or present as all-NaN columns)
+    # are logged and skipped, not re-fetched one by one
+    present = set(raw.columns.get_level_values(0))
+    failed = []
     for t in tickers:
-        try:
-            df = raw[t].dropna(how='all').copy()
-            df.index = pd.to_datetime(df.index)
-            out[t] = df
-        except Exception:
-            try:
-                df2 = yf.download(t, period=LOOKBACK, interval="1d", progress=False)
-                df2.index = pd.to_datetime(df2.index)
-                out[t] = df2
-            except Exception:
-                out[t] = pd.DataFrame()
+        df = raw[t].dropna(how='all') if t in present else pd.DataFrame()
+        if df.empty:
+            failed.append(t)
+            continue
+        df.index = pd.to_datetime(df.index)
+        out[t] = df
+    if failed:
+        logger.warning("no price data for %d ticker(s): %s", len(failed), ", ".join(failed))
     return out
 
 # -------------------------
 # Analysis: pick N_CARDS least-vol tickers
 # -------------------------
-def analyze_universe():
-    price_map = fetch_all(NIFTY50)
-    vol_list = []
-    for tk, df in price_map.items():
-        if df is None or df.empty or 'Close' not in df.columns:
-            continue
-        vol_list.append((tk, annual_vol(df['Close'])))
-    vol_list = [x for x in vol_list if not np.isnan(x[1])]
+def compute_card(tk, vol, df):
+    if df is None or df.empty or 'Close' not in df.columns:
+        return None
+    daily = df['Close'].dropna()
+    if len(daily) < 40:
+        return None
+    weekly = weekly_closes(daily)
+    if len(weekly) < 8:
+        return None
+    try:
+        d = rsi_last(daily.to_numpy()[-RSI_WARMUP_BARS:])
+        w = rsi_last(weekly.to_numpy()[-RSI_WARMUP_BARS:])
+    except Exception:
+        return None
+    # company name from static map (no network call)
+    name = NIFTY50_NAMES.get(tk, "")
+    return {
+        "ticker": tk,
+        "company": name,
+        "daily_rsi": round(d, 2),
+        "weekly_rsi": round(w, 2),
+        "volatility": float(vol),
+        "series_daily": daily.tail(30).to_numpy(dtype=np.float32)
+    }
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def analyze_universe(tickers: tuple):
+    price_map = fetch_all(list(tickers))
+    ohlc = {tk: df[OHLC] for tk, df in price_map.items()
+            if df is not None and not df.empty and set(OHLC).issubset(df.columns)}
+    if not ohlc:
+        return pd.DataFrame()
+    vols = gk_vols(pd.concat(ohlc, axis=1))
+    vol_list = [(tk, float(v)) for tk, v in vols.items() if not np.isnan(v)]
     vol_list.sort(key=lambda x: x[1])
     selected = []
     for tk, vol in vol_list:
         if len(selected) >= N_CARDS:
             break
-        df = price_map.get(tk, pd.DataFrame())
-        if df is None or df.empty or 'Close' not in df.columns:
-            continue
-        daily = df['Close'].dropna()
-        if len(daily) < 40:
-            continue
-        weekly = df.resample('W').last()['Close'].dropna()
-        if len(weekly) < 8:
-            continue
-        try:
-            d = float(rsi(daily).iloc[-1])
-            w = float(rsi(weekly).iloc[-1])
-        except Exception:
-            continue
-        # company name best-effort
-        name = ""
-        try:
-            info = yf.Ticker(tk).info
-            name = info.get("shortName") or info.get("longName") or ""
-        except Exception:
-            name = ""
-        selected.append({
-            "ticker": tk,
-            "company": name,
-            "daily_rsi": round(d, 2),
-            "weekly_rsi": round(w, 2),
-            "volatility": float(vol),
-            "series_daily": daily.tail(40).tolist()
-        })
+        card = compute_card(tk, vol, price_map.get(tk))
+        if card is not None:
+            selected.append(card)
+    if not selected:
+        return pd.DataFrame()
     df = pd.DataFrame(selected).sort_values("volatility").reset_index(drop=True).head(N_CARDS)
-    if df.empty:
-        return df
-    # signals
-    def between(x): return 40 <= x <= 60
-    labels, colors, crosses = [], [], []
-    for _, row in df.iterrows():
-        d = row["daily_rsi"]; w = row["weekly_rsi"]
-        if (d > 60) and between(w):
-            labels.append("Conflict"); colors.append(PALETTE["gray"]); crosses.append(True); continue
-        if (w > 60) and between(d):
-            labels.append("Conflict"); colors.append(PALETTE["gray"]); crosses.append(True); continue
-        if (d > 60) and (w > 60):
-            labels.append("Buy"); colors.append(PALETTE["green"]); crosses.append(False); continue
-        if (d < 40) and (w < 40):
-            labels.append("Sell"); colors.append(PALETTE["red"]); crosses.append(False); continue
-        if between(d) and between(w):
-            labels.append("Neutral"); colors.append(PALETTE["yellow"]); crosses.append(False); continue
-        labels.append("Neutral"); colors.append(PALETTE["yellow"]); crosses.append(False)
-    df["signal"] = labels
-    df["color"] = colors
-    df["cross"] = crosses
+    # signals (np.select picks the first matching condition, so Conflict wins over Buy)
+    d = df["daily_rsi"].to_numpy()
+    w = df["weekly_rsi"].to_numpy()
+    d_mid = (d >= 40) & (d <= 60)
+    w_mid = (w >= 40) & (w <= 60)
+    conflict = ((d > 60) & w_mid) | ((w > 60) & d_mid)
+    buy = (d > 60) & (w > 60)
+    sell = (d < 40) & (w < 40)
+    conds = [conflict, buy, sell]
+    df["signal"] = np.select(conds, ["Conflict", "Buy", "Sell"], default="Neutral")
+    df["color"] = np.select(conds, [PALETTE["gray"], PALETTE["green"], PALETTE["red"]], default=PALETTE["yellow"])
+    df["cross"] = conflict
     return df
 
 # -------------------------
 # sparkline
 # -------------------------
+@lru_cache(maxsize=8)
+def sparkline_xs(width, n):
+    # x positions depend only on (width, n): format them once and share across cards
+    return tuple("%.2f" % x for x in np.linspace(2, width - 2, n).tolist())
+
 def sparkline_svg(values, width=140, height=36, stroke="#0F172A"):
-    if not values or len(values) < 2:
-        return f'<svg width="{width}" height="{height}"></svg>'
-    vals = np.array(values, dtype=float)
+    if values is None or len(values) < 2:
+        return f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg"></svg>'
+    vals = np.asarray(values)  # no copy for the float32 arrays stored by compute_card
     minv, maxv = vals.min(), vals.max()
     if maxv == minv:
         ys = np.ones_like(vals) * (height / 2)
     else:
         ys = height - ((vals - minv) / (maxv - minv) * (height - 6)) - 3
-    xs = np.linspace(2, width - 2, len(vals))
-    path = "M " + " L ".join(f"{x:.2f} {y:.2f}" for x, y in zip(xs, ys))
+    xs = sparkline_xs(width, len(vals))
+    path = "M " + " L ".join(["%s %.2f" % xy for xy in zip(xs, ys.tolist())])
     area = path + f" L {width-2} {height-2} L 2 {height-2} Z"
     svg = (
         f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" xmlns="http://www.w3.org/2000/svg">'
@@ -199,44 +263,53 @@ def sparkline_svg(values, width=140, height=36, stroke="#0F172A"):
     )
     return svg
 
+def svg_img(svg, width, height):
+    # st.html sanitizes with DOMPurify's html-only profile, which drops inline <svg>/<path>;
+    # an <img> with a data: URI passes through and the browser draws the SVG itself
+    b64 = base64.b64encode(svg.encode("utf-8")).decode("ascii")
+    return f'<img src="data:image/svg+xml;base64,{b64}" width="{width}" height="{height}" alt="">'
+
 # -------------------------
 # UI: detect refresh query param -> clear cache and remove it
 # -------------------------
+@st.cache_resource
+def _refresh_state():
+    # process-wide, not per client: each refresh click is a full page load (a new session),
+    # so a refresh from any user within the window also suppresses everyone else's clear
+    return {"last": 0.0, "lock": threading.Lock()}
+
 def handle_query_params():
     params = st.query_params      # modern replacement for experimental_get_query_params
     if "refresh" in params:
-        # clear cache silently
-        try:
-            st.cache_data.clear()
-        except Exception:
-            pass
+        # drop only this app's entries (once per debounce window); the current run then recomputes them
+        state = _refresh_state()
+        with state["lock"]:
+            now = time.monotonic()
+            due = now - state["last"] >= REFRESH_DEBOUNCE_SECONDS
+            if due:
+                state["last"] = now
+        if due:
+            try:
+                fetch_all.clear()
+                analyze_universe.clear()
+            except Exception:
+                pass
 
         # remove ?refresh param
-        st.query_params = {}      # modern replacement for experimental_set_query_params
-
-        # re-run safely
-        try:
-            st.experimental_rerun()   # still allowed as of 2025
-        except Exception:
-            pass
-
+        st.query_params.clear()   # modern replacement for experimental_set_query_params
 
 # -------------------------
 # Build cards HTML and the centered HTML refresh button
 # -------------------------
-def build_page_html(df):
-    font = '<link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;600;700;800&display=swap" rel="stylesheet">'
-    # center heading + HTML Refresh button
-    # the button is an <a> that navigates top-level to ?refresh=<timestamp>, which reloads the app
-    ts = int(time.time())
-    refresh_link = f'?refresh={ts}'
-    header_html = f"""
+# center heading + HTML Refresh button
+# the button is an <a> that navigates to a stable ?refresh=1, which reloads the app
+HEADER_HTML = f"""
     <div style="text-align:center;margin:26px 0 12px 0;">
       <h1 style="font-family:Inter,system-ui; font-size:40px; font-weight:800; margin:0; color:{PALETTE['text']};">
         Least-Volatile NIFTY50 — Daily & Weekly RSI
       </h1>
       <div style="height:12px"></div>
-      <a href="{refresh_link}" target="_top" style="text-decoration:none;">
+      <a href="?refresh=1" style="text-decoration:none;">
         <button style="background:#fff;border:1px solid #E6EEF8;padding:8px 14px;border-radius:999px;box-shadow:0 6px 14px rgba(43,138,235,0.06);cursor:pointer;">
           🔄 Refresh
         </button>
@@ -244,22 +317,24 @@ def build_page_html(df):
     </div>
     """
 
-    # CSS for grid + cards; responsive 1/2/3 columns
-    css = f"""
+# CSS for grid + cards; responsive 1/2/3 columns
+# st.html renders inline (no iframe) and strips <link>, so the font is @import-ed and
+# every card rule is scoped under an rsiapp- prefix to keep it off the rest of the page
+CSS_BLOCK = f"""
     <style>
-      :root{{--text:{PALETTE['text']}; --muted:#6B7280; --shadow:{PALETTE['shadow']};}}
-      body{{font-family:Inter,system-ui,-apple-system,Segoe UI,Roboto,Arial; margin:0; padding:0}}
+      @import url("https://fonts.googleapis.com/css2?family=Inter:wght@300;400;600;700;800&display=swap");
       /* hide Streamlit's sidebar (extra safety) */
       section[data-testid="stSidebar"]{{display:none !important}}
       /* hide default footer/menu */
       footer{{visibility:hidden !important}}
       #MainMenu{{visibility:hidden !important}}
-      .container{{max-width:1200px;margin:0 auto;padding:0 18px 28px;}}
-      .grid{{ display:grid; gap:18px; grid-template-columns: repeat(1, minmax(0, 1fr)); }}
-      @media(min-width:700px){{ .grid{{ grid-template-columns: repeat(2, minmax(0,1fr)); }} }}
-      @media(min-width:1100px){{ .grid{{ grid-template-columns: repeat(3, minmax(0,1fr)); }} }}
+      .rsiapp-container{{--text:{PALETTE['text']}; --muted:#6B7280; --shadow:{PALETTE['shadow']};
+        font-family:Inter,system-ui,-apple-system,Segoe UI,Roboto,Arial; max-width:1200px;margin:0 auto;padding:0 18px 28px;}}
+      .rsiapp-grid{{ display:grid; gap:18px; grid-template-columns: repeat(1, minmax(0, 1fr)); }}
+      @media(min-width:700px){{ .rsiapp-grid{{ grid-template-columns: repeat(2, minmax(0,1fr)); }} }}
+      @media(min-width:1100px){{ .rsiapp-grid{{ grid-template-columns: repeat(3, minmax(0,1fr)); }} }}
 
-      .card{{
+      .rsiapp-card{{
         display:flex;
         background: #fff;
         border-radius:12px;
@@ -268,65 +343,66 @@ def build_page_html(df):
         transition: transform .16s ease, box-shadow .16s ease;
         min-height:120px;
       }}
-      .card:hover{{ transform: translateY(-6px); box-shadow: 0 20px 36px rgba(2,6,23,0.12); }}
-      .left-bar{{ width:10px; flex:0 0 10px; }}
-      .card-body{{ padding:14px 16px; display:flex; flex-direction:column; gap:10px; flex:1; }}
-      .ticker{{ font-weight:800; font-size:15px; color:var(--text); }}
-      .company{{ font-size:12px; color:var(--muted); margin-top:2px; }}
-      .rsi-row{{ display:flex; align-items:center; gap:18px; }}
-      .rsi{{
+      .rsiapp-card:hover{{ transform: translateY(-6px); box-shadow: 0 20px 36px rgba(2,6,23,0.12); }}
+      .rsiapp-left-bar{{ width:10px; flex:0 0 10px; }}
+      .rsiapp-card-body{{ padding:14px 16px; display:flex; flex-direction:column; gap:10px; flex:1; }}
+      .rsiapp-ticker{{ font-weight:800; font-size:15px; color:var(--text); }}
+      .rsiapp-company{{ font-size:12px; color:var(--muted); margin-top:2px; }}
+      .rsiapp-rsi-row{{ display:flex; align-items:center; gap:18px; }}
+      .rsiapp-rsi{{
         min-width:84px;
       }}
-      .rsi-label{{ font-size:12px; color:#6b7280; }}
-      .rsi-value{{ font-weight:800; font-size:15px; margin-top:4px; }}
-      .signal{{ margin-top:8px; font-weight:700; font-size:13px; color:var(--muted); display:inline-block; }}
-      .spark{{ flex:1; }}
+      .rsiapp-rsi-label{{ font-size:12px; color:#6b7280; }}
+      .rsiapp-rsi-value{{ font-weight:800; font-size:15px; margin-top:4px; }}
+      .rsiapp-signal{{ margin-top:8px; font-weight:700; font-size:13px; color:var(--muted); display:inline-block; }}
+      .rsiapp-spark{{ flex:1; }}
     </style>
     """
 
+def build_page_html(df):
     # build cards
-    cards_html = ""
-    for _, row in df.iterrows():
-        color = row["color"]
+    parts = []
+    for row in df.itertuples(index=False, name="Row"):
+        color = row.color
         # left bar color darker shade for visibility
         left_bar = color
         # text color for values: dark for yellow background, dark text; otherwise dark text too for readability
         value_color = "#064E3B" if color != PALETTE["yellow"] else "#064E3B"
-        spark = sparkline_svg(row.get("series_daily", [])[-30:], width=180, height=36, stroke="#0F172A")
-        cross_html = '<div style="opacity:0.6;font-weight:800;">✖</div>' if row.get("cross") else ""
-        company_html = f'<div class="company">{row["company"]}</div>' if row.get("company") else ''
-        card = f"""
-        <article class="card" role="article" aria-label="{row['ticker']}">
-          <div class="left-bar" style="background:{left_bar};"></div>
-          <div class="card-body">
+        spark = svg_img(sparkline_svg(row.series_daily, width=180, height=36, stroke="#0F172A"), 180, 36)
+        cross_html = '<div style="opacity:0.6;font-weight:800;">✖</div>' if row.cross else ""
+        company_html = f'<div class="rsiapp-company">{row.company}</div>' if row.company else ''
+        parts.append(f"""
+        <article class="rsiapp-card" role="article" aria-label="{row.ticker}">
+          <div class="rsiapp-left-bar" style="background:{left_bar};"></div>
+          <div class="rsiapp-card-body">
             <div style="display:flex;justify-content:space-between;align-items:flex-start;">
               <div>
-                <div class="ticker">{row['ticker']}</div>
+                <div class="rsiapp-ticker">{row.ticker}</div>
                 {company_html}
               </div>
               <div style="margin-left:12px">{cross_html}</div>
             </div>
 
-            <div class="rsi-row">
-              <div class="rsi">
-                <div class="rsi-label">Daily</div>
-                <div class="rsi-value" style="color:{value_color};">{row['daily_rsi']:.2f}</div>
+            <div class="rsiapp-rsi-row">
+              <div class="rsiapp-rsi">
+                <div class="rsiapp-rsi-label">Daily</div>
+                <div class="rsiapp-rsi-value" style="color:{value_color};">{row.daily_rsi:.2f}</div>
               </div>
-              <div class="rsi">
-                <div class="rsi-label">Weekly</div>
-                <div class="rsi-value" style="color:{value_color};">{row['weekly_rsi']:.2f}</div>
+              <div class="rsiapp-rsi">
+                <div class="rsiapp-rsi-label">Weekly</div>
+                <div class="rsiapp-rsi-value" style="color:{value_color};">{row.weekly_rsi:.2f}</div>
               </div>
-              <div class="spark">{spark}</div>
+              <div class="rsiapp-spark">{spark}</div>
             </div>
 
-            <div class="signal">{row['signal']}</div>
+            <div class="rsiapp-signal">{row.signal}</div>
           </div>
         </article>
-        """
-        cards_html += card
+        """)
+    cards_html = "".join(parts)
 
-    body = f'<div class="container">{header_html}<div class="grid">{cards_html}</div></div>'
-    return font + css + body
+    body = f'<div class="rsiapp-container">{HEADER_HTML}<div class="rsiapp-grid">{cards_html}</div></div>'
+    return CSS_BLOCK + body
 
 # -------------------------
 # Layout & run
@@ -335,11 +411,11 @@ st.set_page_config(layout="wide", page_title="Least-Vol NIFTY50 RSI")
 # extra CSS to hide streamlit padding (full-width feel)
 st.markdown("<style>div.block-container{{padding-top:0rem;padding-left:0rem;padding-right:0rem;padding-bottom:0rem}}</style>", unsafe_allow_html=True)
 
-# If user clicked the HTML refresh link, clear cache then remove param and rerun
+# If user clicked the HTML refresh link, clear cache then remove param
 handle_query_params()
 
 with st.spinner("Fetching data and computing RSI..."):
-    df = analyze_universe()
+    df = analyze_universe(tuple(NIFTY50))
 
 if df.empty:
     st.warning("No tickers available — possibly yfinance rate-limit or missing history. Try Refresh in a moment.")
@@ -348,11 +424,5 @@ if df.empty:
 # build the page HTML
 html = build_page_html(df)
 
-# Compute a safe height so the HTML iframe is tall enough and doesn't clip:
-# rows = ceil(n / columns), columns adapt by CSS but we choose 3 for height calc (safe overestimate)
-cols_for_calc = 3
-rows = math.ceil(len(df) / cols_for_calc)
-iframe_height = max(360, rows * CARD_HEIGHT + 120)  # minimal safe height
-
-# Render the whole page area in one component (scrolling allowed if window smaller)
-components.html(html, height=iframe_height, scrolling=True)
+# Render the whole page inline (no iframe, so no height to precompute)
+st.html(html)